@@ -12,6 +12,7 @@
 #define ECX_SSE42_BIT 20
 #define ECX_AVXOS_BIT 27
 #define ECX_AVX_BIT 28
+#define EBX_AVX2_BIT 5
 
 
 uint64_t get_supported_flags()
@@ -49,6 +50,9 @@ uint64_t get_supported_flags()
     if (strcmp(comp_flag, "-mavx\0") == 0) {
       supp_comp_flgs |= (1 << ECX_AVX_BIT);
     }
+    if (strcmp(comp_flag, "-mavx2\0") == 0) {
+      supp_comp_flgs |= (1 << EBX_AVX2_BIT);
+    }
   }
 
   return supp_comp_flgs;
@@ -62,6 +66,7 @@ int is_supported(int cpuid_reg, uint64_t comp_flags, int feature_bit)
 int main(int argc, char** argv)
 {
   int feature_eax, feature_ebx, feature_ecx, feature_edx;
+  int feature7_eax, feature7_ebx, feature7_ecx, feature7_edx;
   uint64_t supp_comp_flgs = get_supported_flags();
   FILE *f = fopen("compiler_flags", "w");
 
@@ -69,6 +74,11 @@ int main(int argc, char** argv)
     : "=a" (feature_eax), "=b" (feature_ebx), "=c" (feature_ecx), "=d" (feature_edx)
     : "a" (0x00000001));
 
+  // Extended features (AVX2 and friends) live in leaf 7, subleaf 0
+  __asm__("cpuid"
+    : "=a" (feature7_eax), "=b" (feature7_ebx), "=c" (feature7_ecx), "=d" (feature7_edx)
+    : "a" (0x00000007), "c" (0x00000000));
+
   if (is_supported(feature_edx, supp_comp_flgs, EDX_MMX_BIT)) {
     fprintf(f, "-mmmx -DINTEL_MMX ");
   } 
@@ -95,6 +105,12 @@ int main(int argc, char** argv)
       fprintf(f, "-mavx -DINTEL_AVX ");
     }
   }
+  if (is_supported(feature7_ebx, supp_comp_flgs, EBX_AVX2_BIT)) {
+    // AVX2 needs the same OS-level AVX state support as AVX
+    if ((feature_ecx >> ECX_AVXOS_BIT) & 0x1) {
+      fprintf(f, "-mavx2 -DINTEL_AVX2 ");
+    }
+  }
   fclose(f);
   return 0;
 }
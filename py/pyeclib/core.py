@@ -25,7 +25,6 @@ from .ec_iface import ECDriverError
 from .ec_iface import ECInsufficientFragments
 from .ec_iface import PyECLib_FRAGHDRCHKSUM_Types
 
-import math
 import pyeclib_c
 import sys
 
@@ -60,6 +59,11 @@ class ECPyECLibDriver(object):
             self.algsig_chksum,
             validate)
 
+        # The required-fragments answer is a pure function of the index
+        # sets for a given handle, and read paths with a dead disk keep
+        # asking about the same pattern, so memoize it
+        self._required_fragments_cache = {}
+
     def encode(self, data_bytes):
         return pyeclib_c.encode(self.handle, data_bytes)
 
@@ -67,25 +71,29 @@ class ECPyECLibDriver(object):
         if len(fragments) == 0 or len(fragments[0]) == 0:
             return -1
         fragment_len = len(fragments[0])
-        for fragment in fragments[1:]:
+        # Iterating the list directly avoids slicing off a copy per call
+        for fragment in fragments:
             if len(fragment) != fragment_len:
                 return -1
         return fragment_len
 
     def decode(self, fragment_payloads, ranges=None,
                force_metadata_checks=False):
-        _fragment_payloads = list(fragment_payloads)
+        # The C extension needs a real list but only reads from it, so
+        # the copy is only required for other iterables
+        if not isinstance(fragment_payloads, list):
+            fragment_payloads = list(fragment_payloads)
         fragment_len = self._validate_and_return_fragment_size(
-            _fragment_payloads)
+            fragment_payloads)
         if fragment_len < 0:
             raise ECDriverError(
                 "Invalid fragment payload in ECPyECLibDriver.decode")
 
-        if len(_fragment_payloads) < self.k:
+        if len(fragment_payloads) < self.k:
             raise ECInsufficientFragments(
                 "Not enough fragments given in ECPyECLibDriver.decode")
 
-        return pyeclib_c.decode(self.handle, _fragment_payloads,
+        return pyeclib_c.decode(self.handle, fragment_payloads,
                                 fragment_len, ranges, force_metadata_checks)
 
     def reconstruct(self, fragment_payloads, indexes_to_reconstruct):
@@ -102,10 +110,8 @@ class ECPyECLibDriver(object):
         # The parity cannot be reconstructed until
         # after all data is reconstructed
         indexes_to_reconstruct.sort()
-        _indexes_to_reconstruct = indexes_to_reconstruct[:]
 
-        while len(_indexes_to_reconstruct) > 0:
-            index = _indexes_to_reconstruct.pop(0)
+        for index in indexes_to_reconstruct:
             reconstructed = pyeclib_c.reconstruct(
                 self.handle, _fragment_payloads, fragment_len, index)
             reconstructed_data.append(reconstructed)
@@ -114,9 +120,14 @@ class ECPyECLibDriver(object):
         return reconstructed_data
 
     def fragments_needed(self, reconstruct_indexes, exclude_indexes):
-        required_fragments = pyeclib_c.get_required_fragments(
-            self.handle, reconstruct_indexes, exclude_indexes)
-        return required_fragments
+        key = (tuple(reconstruct_indexes), tuple(exclude_indexes))
+        required_fragments = self._required_fragments_cache.get(key)
+        if required_fragments is None:
+            required_fragments = pyeclib_c.get_required_fragments(
+                self.handle, reconstruct_indexes, exclude_indexes)
+            self._required_fragments_cache[key] = required_fragments
+        # Copy so a caller mutating the result cannot poison the cache
+        return list(required_fragments)
 
     def min_parity_fragments_needed(self):
         """ FIXME - fix this to return a function of HD """
@@ -198,21 +209,16 @@ class ECStripingDriver(object):
         :returns: a list of k buffers (data only)
         :raises: ECDriverError if there is an error during encoding
         """
-        # Main fragment size
-        fragment_size = math.ceil(len(data_bytes) / float(self.k))
-
-        # Size of last fragment
-        last_fragment_size = len(data_bytes) - (fragment_size * self.k - 1)
+        # Main fragment size (ceiling of len / k, using integer math)
+        fragment_size = -(-len(data_bytes) // self.k)
 
-        fragments = []
-        offset = 0
-        for i in range(self.k - 1):
-            fragments.append(data_bytes[offset:fragment_size])
-            offset += fragment_size
+        # Slicing a memoryview is O(1) and copy-free, so only the final
+        # tobytes() touches the data.  The last slice is clamped to the
+        # end of the buffer by the slicing rules.
+        data_view = memoryview(data_bytes)
 
-        fragments.append(data_bytes[offset:last_fragment_size])
-
-        return fragments
+        return [data_view[i * fragment_size:(i + 1) * fragment_size].tobytes()
+                for i in range(self.k)]
 
     def decode(self, fragment_payloads, ranges=None,
                force_metadata_checks=False):
@@ -235,12 +241,9 @@ class ECStripingDriver(object):
                 "Decode requires %d fragments, %d fragments were given" %
                 (len(fragment_payloads), self.k))
 
-        ret_string = ''
-
-        for fragment in fragment_payloads:
-            ret_string += fragment
-
-        return ret_string
+        # join() sizes the result up front and copies each fragment once,
+        # where repeated += would recopy the accumulator every iteration
+        return b''.join(fragment_payloads)
 
     def reconstruct(self, available_fragment_payloads,
                     missing_fragment_indexes):
@@ -55,6 +55,7 @@
   #define PyInt_FromLong PyLong_FromLong
   #define PyString_FromString PyUnicode_FromString
   #define ENCODE_ARGS "Oy#"
+  #define ENCODE_REPEATED_ARGS "Oy#i"
   #define GET_METADATA_ARGS "Oy#i"
 #else
   #define MOD_ERROR_VAL
@@ -65,6 +66,7 @@
   #define PY_BUILDVALUE_OBJ_LEN(obj, objlen) \
           Py_BuildValue("s#", obj, (Py_ssize_t)objlen)
   #define ENCODE_ARGS "Os#"
+  #define ENCODE_REPEATED_ARGS "Os#i"
   #define GET_METADATA_ARGS "Os#i"
 #endif
 
@@ -81,6 +83,7 @@ static PyObject * pyeclib_c_init(PyObject *self, PyObject *args);
 static void pyeclib_c_destructor(PyObject *obj);
 static PyObject * pyeclib_c_get_segment_info(PyObject *self, PyObject *args);
 static PyObject * pyeclib_c_encode(PyObject *self, PyObject *args);
+static PyObject * pyeclib_c_encode_repeated(PyObject *self, PyObject *args);
 static PyObject * pyeclib_c_reconstruct(PyObject *self, PyObject *args);
 static PyObject * pyeclib_c_decode(PyObject *self, PyObject *args);
 static PyObject * pyeclib_c_get_metadata(PyObject *self, PyObject *args);
@@ -506,10 +509,14 @@ pyeclib_c_encode(PyObject *self, PyObject *args)
     return NULL;
   }
 
+  /* The encode kernel only touches caller-owned buffers, so let other
+   * Python threads run while it works */
+  Py_BEGIN_ALLOW_THREADS
   ret = liberasurecode_encode(pyeclib_handle->ec_desc, data, data_len, &encoded_data, &encoded_parity, &fragment_len);
+  Py_END_ALLOW_THREADS
   if (ret < 0) {
     pyeclib_c_seterr(ret, "pyeclib_c_encode ERROR: ");
-    return NULL; 
+    return NULL;
   }
   
   /* Create the python list of fragments to return */
@@ -532,7 +539,97 @@ pyeclib_c_encode(PyObject *self, PyObject *args)
   }
 
   liberasurecode_encode_cleanup(pyeclib_handle->ec_desc, encoded_data, encoded_parity);
-  
+
+  return list_of_strips;
+}
+
+
+/**
+ * Erasure encode a data buffer a number of times.
+ *
+ * The arguments are converted once and the encode kernel is then run
+ * iterations times back to back, so benchmark harnesses can time the
+ * kernel without per-iteration Python/C transitions.  The fragments
+ * from the final iteration are returned.
+ *
+ * @param pyeclib_obj_handle
+ * @param data to encode
+ * @param iterations number of times to run the encode
+ * @return python list of encoded data and parity elements
+ */
+static PyObject *
+pyeclib_c_encode_repeated(PyObject *self, PyObject *args)
+{
+  PyObject *pyeclib_obj_handle = NULL;
+  pyeclib_t *pyeclib_handle= NULL;
+  char **encoded_data = NULL;       /* array of k data buffers */
+  char **encoded_parity = NULL;     /* array of m parity buffers */
+  PyObject *list_of_strips = NULL;  /* list of encoded strips to return */
+  char *data;                       /* param, data buffer to encode */
+  int data_len;                     /* param, length of data buffer */
+  int iterations;                   /* param, number of encodes to run */
+  uint64_t fragment_len;            /* length, in bytes of the fragments */
+  int i;                            /* a counter */
+  int l;                            /* iteration counter */
+  int ret = 0;
+
+  /* Assume binary data (force "byte array" input) */
+  if (!PyArg_ParseTuple(args, ENCODE_REPEATED_ARGS, &pyeclib_obj_handle,
+                        &data, &data_len, &iterations)) {
+    pyeclib_c_seterr(-EINVALIDPARAMS, "pyeclib_c_encode_repeated ERROR: ");
+    return NULL;
+  }
+  pyeclib_handle = (pyeclib_t*)PyCapsule_GetPointer(pyeclib_obj_handle, PYECC_HANDLE_NAME);
+  if (pyeclib_handle == NULL) {
+    pyeclib_c_seterr(-EINVALIDPARAMS, "pyeclib_c_encode_repeated ERROR: ");
+    return NULL;
+  }
+  if (iterations < 1) {
+    pyeclib_c_seterr(-EINVALIDPARAMS, "pyeclib_c_encode_repeated ERROR: ");
+    return NULL;
+  }
+
+  /* All iterations but the last just exercise the kernel.  No Python
+   * state is touched until the final fragments are wrapped, so the
+   * whole batch runs without the GIL. */
+  Py_BEGIN_ALLOW_THREADS
+  for (l = 0; l < iterations - 1; l++) {
+    ret = liberasurecode_encode(pyeclib_handle->ec_desc, data, data_len, &encoded_data, &encoded_parity, &fragment_len);
+    if (ret < 0) {
+      break;
+    }
+    liberasurecode_encode_cleanup(pyeclib_handle->ec_desc, encoded_data, encoded_parity);
+  }
+  if (ret == 0) {
+    ret = liberasurecode_encode(pyeclib_handle->ec_desc, data, data_len, &encoded_data, &encoded_parity, &fragment_len);
+  }
+  Py_END_ALLOW_THREADS
+  if (ret < 0) {
+    pyeclib_c_seterr(ret, "pyeclib_c_encode_repeated ERROR: ");
+    return NULL;
+  }
+
+  /* Create the python list of fragments to return */
+  list_of_strips = PyList_New(pyeclib_handle->ec_args.k + pyeclib_handle->ec_args.m);
+  if (NULL == list_of_strips) {
+    pyeclib_c_seterr(-ENOMEM, "pyeclib_c_encode_repeated ERROR: ");
+    return NULL;
+  }
+
+  /* Add data fragments to the python list to return */
+  for (i = 0; i < pyeclib_handle->ec_args.k; i++) {
+    PyList_SET_ITEM(list_of_strips, i,
+                    PY_BUILDVALUE_OBJ_LEN(encoded_data[i], fragment_len));
+  }
+
+  /* Add parity fragments to the python list to return */
+  for (i = 0; i < pyeclib_handle->ec_args.m; i++) {
+    PyList_SET_ITEM(list_of_strips, pyeclib_handle->ec_args.k + i,
+                    PY_BUILDVALUE_OBJ_LEN(encoded_parity[i], fragment_len));
+  }
+
+  liberasurecode_encode_cleanup(pyeclib_handle->ec_desc, encoded_data, encoded_parity);
+
   return list_of_strips;
 }
 
@@ -661,6 +758,7 @@ pyeclib_c_reconstruct(PyObject *self, PyObject *args)
   int fragment_len;                     /* param, size in bytes of fragment */
   int num_fragments;                    /* number of fragments passed in */
   char **c_fragments = NULL;            /* C array containing the fragment payloads */
+  PyObject **fragment_refs = NULL;      /* refs pinning the payloads while the GIL is dropped */
   int destination_idx;                  /* param, index to reconstruct */
   int ret;                              /* decode matrix creation return val */
   int i = 0;                            /* a counter */
@@ -697,19 +795,31 @@ pyeclib_c_reconstruct(PyObject *self, PyObject *args)
     goto error;
   }
 
-  /* Put the fragments into an array of C strings */
+  fragment_refs = (PyObject **) alloc_zeroed_buffer(sizeof(PyObject *) * num_fragments);
+  if (NULL == fragment_refs) {
+    pyeclib_c_seterr(-ENOMEM, "pyeclib_c_reconstruct ERROR: ");
+    goto error;
+  }
+
+  /* Put the fragments into an array of C strings.  Hold a reference to
+   * each payload so nothing can free the buffers once the GIL drops. */
   for (i = 0; i < num_fragments; i++) {
     PyObject *tmp_data = PyList_GetItem(fragments, i);
     Py_ssize_t len = 0;
+    Py_INCREF(tmp_data);
+    fragment_refs[i] = tmp_data;
     PyBytes_AsStringAndSize(tmp_data, &(c_fragments[i]), &len);
   }
   
-  ret = liberasurecode_reconstruct_fragment(pyeclib_handle->ec_desc, 
-                                            c_fragments, 
-                                            num_fragments, 
-                                            fragment_len, 
-                                            destination_idx, 
-                                            c_reconstructed); 
+  /* Pure C from here until the reconstructed buffer is wrapped */
+  Py_BEGIN_ALLOW_THREADS
+  ret = liberasurecode_reconstruct_fragment(pyeclib_handle->ec_desc,
+                                            c_fragments,
+                                            num_fragments,
+                                            fragment_len,
+                                            destination_idx,
+                                            c_reconstructed);
+  Py_END_ALLOW_THREADS
   if (ret < 0) {
     pyeclib_c_seterr(ret, "pyeclib_c_reconstruct ERROR: ");
     reconstructed = NULL;
@@ -721,8 +831,14 @@ pyeclib_c_reconstruct(PyObject *self, PyObject *args)
 
 error:
   reconstructed = NULL;
-  
+
 out:
+  if (fragment_refs != NULL) {
+    for (i = 0; i < num_fragments; i++) {
+      Py_XDECREF(fragment_refs[i]);
+    }
+  }
+  check_and_free_buffer(fragment_refs);
   check_and_free_buffer(c_fragments);
   check_and_free_buffer(c_reconstructed);
 
@@ -752,6 +868,7 @@ pyeclib_c_decode(PyObject *self, PyObject *args)
   int num_ranges = 0;                     /* number of specified ranges */
   int fragment_len;                       /* param, size in bytes of fragment */
   char **c_fragments = NULL;              /* k length array of data buffers */
+  PyObject **fragment_refs = NULL;        /* refs pinning the payloads while the GIL is dropped */
   int num_fragments;                      /* param, number of fragments */
   char *c_orig_payload = NULL;            /* buffer to store original payload in */
   uint64_t range_payload_size = 0;        /* length of buffer used to store byte ranges */
@@ -847,21 +964,33 @@ pyeclib_c_decode(PyObject *self, PyObject *args)
   if (NULL == c_fragments) {
     goto error;
   }
-  
-  /* Put the fragments into an array of C strings */
+
+  fragment_refs = (PyObject **) alloc_zeroed_buffer(sizeof(PyObject *) * num_fragments);
+  if (NULL == fragment_refs) {
+    pyeclib_c_seterr(-ENOMEM, "pyeclib_c_decode ERROR: ");
+    goto error;
+  }
+
+  /* Put the fragments into an array of C strings.  Hold a reference to
+   * each payload so nothing can free the buffers once the GIL drops. */
   for (i = 0; i < num_fragments; i++) {
     PyObject *tmp_data = PyList_GetItem(fragments, i);
     Py_ssize_t len = 0;
+    Py_INCREF(tmp_data);
+    fragment_refs[i] = tmp_data;
     PyBytes_AsStringAndSize(tmp_data, &(c_fragments[i]), &len);
   }
 
-  ret = liberasurecode_decode(pyeclib_handle->ec_desc, 
+  /* Pure C from here until the decoded payload is wrapped */
+  Py_BEGIN_ALLOW_THREADS
+  ret = liberasurecode_decode(pyeclib_handle->ec_desc,
                             c_fragments,
                             num_fragments,
                             fragment_len,
                             force_metadata_checks,
                             &c_orig_payload,
                             &orig_data_size);
+  Py_END_ALLOW_THREADS
 
   if (ret < 0) {
     pyeclib_c_seterr(ret, "pyeclib_c_decode ERROR: ");
@@ -894,9 +1023,15 @@ error:
   ret_payload = NULL;
 
 exit:
+  if (fragment_refs != NULL) {
+    for (i = 0; i < num_fragments; i++) {
+      Py_XDECREF(fragment_refs[i]);
+    }
+  }
+  check_and_free_buffer(fragment_refs);
   check_and_free_buffer(c_fragments);
   check_and_free_buffer(c_ranges);
-  liberasurecode_decode_cleanup(pyeclib_handle->ec_desc, c_orig_payload); 
+  liberasurecode_decode_cleanup(pyeclib_handle->ec_desc, c_orig_payload);
 
   return ret_payload;
 }
@@ -1187,6 +1322,7 @@ pyeclib_c_liberasurecode_version(PyObject *self, PyObject *args) {
 static PyMethodDef PyECLibMethods[] = {
     {"init",  pyeclib_c_init, METH_VARARGS, "Initialize a new erasure encoder/decoder"},
     {"encode",  pyeclib_c_encode, METH_VARARGS, "Create parity using source data"},
+    {"encode_repeated",  pyeclib_c_encode_repeated, METH_VARARGS, "Create parity using source data a number of times over"},
     {"decode",  pyeclib_c_decode, METH_VARARGS, "Recover all lost data/parity"},
     {"reconstruct",  pyeclib_c_reconstruct, METH_VARARGS, "Recover selective data/parity"},
     {"get_required_fragments", pyeclib_c_get_required_fragments, METH_VARARGS, "Return the fragments required to reconstruct a set of missing fragments"},
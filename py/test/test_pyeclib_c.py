@@ -21,10 +21,9 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
 # THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import os
 import random
-from string import ascii_letters
 import sys
-import tempfile
 import time
 import unittest
 
@@ -84,16 +83,22 @@ class TestPyECLib(unittest.TestCase):
         self.files = {}
         self._create_tmp_files()
 
+        # liberasurecode handles, keyed by (k, m, ec_type, hd).  init
+        # allocates backend state (e.g. GF tables), so reuse handles
+        # across the parameter sweeps instead of re-initializing for
+        # every size and iteration batch.
+        self._handle_cache = {}
+
         unittest.TestCase.__init__(self, *args)
 
     def _create_tmp_files(self):
         """
-        Create the temporary files needed for testing.  Use the tempfile
-        package so that the files will be automatically removed during
-        garbage collection.
+        Create the buffers needed for testing.  The buffers are kept in
+        memory so that reading one back is a dict lookup rather than a
+        filesystem round trip.
         """
         for size_str in self.sizes:
-            # Determine the size of the file to create
+            # Determine the size of the buffer to create
             size_desc = size_str.split("-")
             size = int(size_desc[0])
             if size_desc[1] == 'M':
@@ -101,30 +106,28 @@ class TestPyECLib(unittest.TestCase):
             elif size_desc[1] == 'K':
                 size *= 1000
 
-            # Create the dictionary of files to test with
-            buf = ''.join(random.choice(ascii_letters) for i in range(size))
-            if sys.version_info >= (3,):
-                buf = buf.encode('ascii')
-            tmp_file = tempfile.NamedTemporaryFile('w+b')
-            tmp_file.write(buf)
-            self.files[size_str] = tmp_file
+            # Create the dictionary of buffers to test with.  The EC code
+            # paths are byte-agnostic, so a single os.urandom call beats
+            # generating the payload one random character at a time.
+            self.files[size_str] = os.urandom(size)
 
     def get_tmp_file(self, name):
         """
-        Acquire a temp file from the dictionary of pre-built, random files
-        with the seek position to the head of the file.
+        Acquire a buffer from the dictionary of pre-built, random buffers.
         """
-        tmp_file = self.files.get(name, None)
-
-        if tmp_file:
-            tmp_file.seek(0, 0)
-
-        return tmp_file
+        return self.files.get(name, None)
 
-    def setUp(self):
-        # Ensure that the file offset is set to the head of the file
-        for _, tmp_file in self.files.items():
-            tmp_file.seek(0, 0)
+    def get_handle(self, num_data, num_parity, ec_type, hd):
+        """
+        Acquire a liberasurecode handle for the given parameters, creating
+        and caching it on first use.
+        """
+        key = (num_data, num_parity, ec_type, hd)
+        handle = self._handle_cache.get(key)
+        if handle is None:
+            handle = pyeclib_c.init(num_data, num_parity, ec_type, hd)
+            self._handle_cache[key] = handle
+        return handle
 
     def tearDown(self):
         pass
@@ -148,12 +151,11 @@ class TestPyECLib(unittest.TestCase):
         """
         timer = Timer()
         tsum = 0
-        handle = pyeclib_c.init(num_data, num_parity, ec_type, hd)
-        whole_file_bytes = self.get_tmp_file(file_size).read()
+        handle = self.get_handle(num_data, num_parity, ec_type, hd)
+        whole_file_bytes = self.get_tmp_file(file_size)
 
         timer.start()
-        for l in range(iterations):
-            pyeclib_c.encode(handle, whole_file_bytes)
+        pyeclib_c.encode_repeated(handle, whole_file_bytes, iterations)
         tsum = timer.stop_and_return()
 
         return tsum / iterations
@@ -166,28 +168,27 @@ class TestPyECLib(unittest.TestCase):
         """
         timer = Timer()
         tsum = 0
-        handle = pyeclib_c.init(num_data, num_parity, ec_type, hd)
-        whole_file_bytes = self.get_tmp_file(file_size).read()
+        handle = self.get_handle(num_data, num_parity, ec_type, hd)
+        whole_file_bytes = self.get_tmp_file(file_size)
         success = True
 
-        fragments = pyeclib_c.encode(handle, whole_file_bytes)
-        orig_fragments = fragments[:]
+        orig_fragments = pyeclib_c.encode(handle, whole_file_bytes)
+        frag_len = len(orig_fragments[0])
+        num_missing = max(hd - 1, 0)
 
         for i in range(iterations):
-            num_missing = hd - 1
-            for j in range(num_missing):
-                num_frags_left = len(fragments)
-                idx = random.randint(0, num_frags_left - 1)
-                fragments.pop(idx)
+            missing_idxs = random.sample(range(len(orig_fragments)),
+                                         num_missing)
+            fragments = [fragment
+                         for idx, fragment in enumerate(orig_fragments)
+                         if idx not in missing_idxs]
 
             timer.start()
             decoded_file_bytes = pyeclib_c.decode(handle,
                                                   fragments,
-                                                  len(fragments[0]))
+                                                  frag_len)
             tsum += timer.stop_and_return()
 
-            fragments = orig_fragments[:]
-
             if whole_file_bytes != decoded_file_bytes:
                 success = False
 
@@ -201,8 +202,8 @@ class TestPyECLib(unittest.TestCase):
         """
         timer = Timer()
         tsum = 0
-        handle = pyeclib_c.init(num_data, num_parity, ec_type, hd)
-        whole_file_bytes = self.get_tmp_file(file_size).read()
+        handle = self.get_handle(num_data, num_parity, ec_type, hd)
+        whole_file_bytes = self.get_tmp_file(file_size)
         success = True
 
         begins = [int(random.randint(0, len(whole_file_bytes) - 1))
@@ -212,25 +213,24 @@ class TestPyECLib(unittest.TestCase):
 
         ranges = list(zip(begins, ends))
 
-        fragments = pyeclib_c.encode(handle, whole_file_bytes)
-        orig_fragments = fragments[:]
+        orig_fragments = pyeclib_c.encode(handle, whole_file_bytes)
+        frag_len = len(orig_fragments[0])
+        num_missing = max(hd - 1, 0)
 
         for i in range(iterations):
-            num_missing = hd - 1
-            for j in range(num_missing):
-                num_frags_left = len(fragments)
-                idx = random.randint(0, num_frags_left - 1)
-                fragments.pop(idx)
+            missing_idxs = random.sample(range(len(orig_fragments)),
+                                         num_missing)
+            fragments = [fragment
+                         for idx, fragment in enumerate(orig_fragments)
+                         if idx not in missing_idxs]
 
             timer.start()
             decoded_file_ranges = pyeclib_c.decode(handle,
                                                    fragments,
-                                                   len(fragments[0]),
+                                                   frag_len,
                                                    ranges)
             tsum += timer.stop_and_return()
 
-            fragments = orig_fragments[:]
-
             range_offset = 0
             for r in ranges:
                 if whole_file_bytes[
@@ -248,28 +248,25 @@ class TestPyECLib(unittest.TestCase):
         """
         timer = Timer()
         tsum = 0
-        handle = pyeclib_c.init(num_data, num_parity, ec_type, hd)
-        whole_file_bytes = self.get_tmp_file(file_size).read()
+        handle = self.get_handle(num_data, num_parity, ec_type, hd)
+        whole_file_bytes = self.get_tmp_file(file_size)
         success = True
 
         orig_fragments = pyeclib_c.encode(handle, whole_file_bytes)
+        frag_len = len(orig_fragments[0])
+        num_missing = 1
 
         for i in range(iterations):
-            fragments = orig_fragments[:]
-            num_missing = 1
-            missing_idxs = []
-            for j in range(num_missing):
-                num_frags_left = len(fragments)
-                idx = random.randint(0, num_frags_left - 1)
-                while idx in missing_idxs:
-                    idx = random.randint(0, num_frags_left - 1)
-                missing_idxs.append(idx)
-                fragments.pop(idx)
+            missing_idxs = random.sample(range(len(orig_fragments)),
+                                         num_missing)
+            fragments = [fragment
+                         for idx, fragment in enumerate(orig_fragments)
+                         if idx not in missing_idxs]
 
             timer.start()
             reconstructed_fragment = pyeclib_c.reconstruct(handle,
                                                            fragments,
-                                                           len(fragments[0]),
+                                                           frag_len,
                                                            missing_idxs[0])
             tsum += timer.stop_and_return()
 
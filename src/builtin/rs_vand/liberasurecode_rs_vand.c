@@ -31,16 +31,69 @@
 // like Jerasure with GF-Complete will give users the ability to tune to their
 // architecture (Intel or ARM), CPU and memory (lots of options).
 
+#ifdef INTEL_AVX2
+#include <immintrin.h>  //AVX2
+#elif defined(INTEL_SSE2)
+#include <emmintrin.h>  //SSE2
+#endif
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
 #include <stdint.h>
+#include <pthread.h>
 #include <rs_galois.h>
 #include <liberasurecode_rs_vand.h>
 
 #include <unistd.h>
 #include <fcntl.h>
 
+// Split multiply tables built lazily, one pair per multiplier value.
+// A given (k, m) instance only ever multiplies by the constants in its
+// generator and decoding matrices, so after the first touch every
+// region_multiply for that instance runs on precomputed tables.  Each
+// entry holds the 256 low-byte products followed by the 256 high-byte
+// products.
+static uint16_t *mult_table_cache[FIELD_SIZE] = { NULL };
+static pthread_mutex_t mult_table_cache_lock = PTHREAD_MUTEX_INITIALIZER;
+
+static uint16_t * get_split_mult_tables(int mult)
+{
+  uint16_t *tables;
+  int i;
+
+  // The lock is taken on the read path as well: without it nothing
+  // orders the table fill before the pointer publish for a lock-free
+  // reader on weakly-ordered CPUs.  It is uncontended after warm-up
+  // and cheap next to the region work it fronts.
+  pthread_mutex_lock(&mult_table_cache_lock);
+  tables = mult_table_cache[mult];
+  if (NULL == tables) {
+    tables = (uint16_t*)malloc(sizeof(uint16_t)*512);
+    if (NULL != tables) {
+      for (i = 0; i < 256; i++) {
+        tables[i] = (uint16_t)rs_galois_mult(i, mult);
+        tables[256 + i] = (uint16_t)rs_galois_mult(i << 8, mult);
+      }
+      mult_table_cache[mult] = tables;
+    }
+  }
+  pthread_mutex_unlock(&mult_table_cache_lock);
+
+  return tables;
+}
+
+static void free_split_mult_tables()
+{
+  int i;
+
+  pthread_mutex_lock(&mult_table_cache_lock);
+  for (i = 0; i < FIELD_SIZE; i++) {
+    free(mult_table_cache[i]);
+    mult_table_cache[i] = NULL;
+  }
+  pthread_mutex_unlock(&mult_table_cache_lock);
+}
+
 void print_matrix(int *matrix, int rows, int cols)
 {
   int i, j;
@@ -139,6 +192,7 @@ void init_liberasurecode_rs_vand(int k, int m)
 
 void deinit_liberasurecode_rs_vand()
 {
+  free_split_mult_tables();
   rs_galois_deinit_tables();
 }
 
@@ -340,17 +394,39 @@ int gaussj_inversion(int *matrix, int *inverse, int n)
 void region_xor(char *from_buf, char *to_buf, int blocksize)
 {
   int i;
-  
+  int fast_blocksize;
+
+#ifdef INTEL_AVX2
+  // 256-bit XOR; fragment buffers are not guaranteed to be 32-byte
+  // aligned, so use the unaligned load/store forms
+  fast_blocksize = blocksize - (blocksize % (int)sizeof(__m256i));
+
+  for (i = 0; i < fast_blocksize; i += (int)sizeof(__m256i)) {
+    __m256i from = _mm256_loadu_si256((__m256i*)(from_buf + i));
+    __m256i to = _mm256_loadu_si256((__m256i*)(to_buf + i));
+    _mm256_storeu_si256((__m256i*)(to_buf + i), _mm256_xor_si256(from, to));
+  }
+#elif defined(INTEL_SSE2)
+  fast_blocksize = blocksize - (blocksize % (int)sizeof(__m128i));
+
+  for (i = 0; i < fast_blocksize; i += (int)sizeof(__m128i)) {
+    __m128i from = _mm_loadu_si128((__m128i*)(from_buf + i));
+    __m128i to = _mm_loadu_si128((__m128i*)(to_buf + i));
+    _mm_storeu_si128((__m128i*)(to_buf + i), _mm_xor_si128(from, to));
+  }
+#else
   uint32_t *_from_buf = (uint32_t*)from_buf;
   uint32_t *_to_buf = (uint32_t*)to_buf;
   int adj_blocksize = blocksize / 4;
-  int trailing_bytes = blocksize % 4;
+
+  fast_blocksize = adj_blocksize * 4;
 
   for (i = 0; i < adj_blocksize; i++) {
     _to_buf[i] = _to_buf[i] ^ _from_buf[i];
   }
-  
-  for (i = blocksize-trailing_bytes; i < blocksize; i++) {
+#endif
+
+  for (i = fast_blocksize; i < blocksize; i++) {
     to_buf[i] = to_buf[i] ^ from_buf[i];
   }
 }
@@ -362,24 +438,58 @@ void region_multiply(char *from_buf, char *to_buf, int mult, int xor, int blocks
   uint16_t *_to_buf = (uint16_t*)to_buf;
   int adj_blocksize = blocksize / 2;
   int trailing_bytes = blocksize % 2;
+  const uint16_t *low_mult_table;
+  const uint16_t *high_mult_table;
+  const uint16_t *tables = get_split_mult_tables(mult);
+
+  // Multiply directly if the cache could not allocate the tables
+  if (NULL == tables) {
+    if (xor) {
+      for (i = 0; i < adj_blocksize; i++) {
+        _to_buf[i] = _to_buf[i] ^ (uint16_t)rs_galois_mult(_from_buf[i], mult);
+      }
+    } else {
+      for (i = 0; i < adj_blocksize; i++) {
+        _to_buf[i] = (uint16_t)rs_galois_mult(_from_buf[i], mult);
+      }
+    }
+    if (trailing_bytes == 1) {
+      i = blocksize - 1;
+      if (xor) {
+        to_buf[i] = to_buf[i] ^ (char)rs_galois_mult((unsigned char)from_buf[i], mult);
+      } else {
+        to_buf[i] = (char)rs_galois_mult((unsigned char)from_buf[i], mult);
+      }
+    }
+    return;
+  }
+
+  // Multiplication by a constant distributes over the high and low
+  // bytes of each element: mult * x = mult * low(x) ^ mult * (high(x) << 8),
+  // so each element costs two table loads and an XOR instead of the
+  // per-element log/ilog lookups and zero test
+  low_mult_table = tables;
+  high_mult_table = tables + 256;
 
   if (xor) {
     for (i = 0; i < adj_blocksize; i++) {
-      _to_buf[i] = _to_buf[i] ^ (uint16_t)rs_galois_mult(_from_buf[i], mult);
+      uint16_t from = _from_buf[i];
+      _to_buf[i] = _to_buf[i] ^ low_mult_table[from & 0xff] ^ high_mult_table[from >> 8];
     }
-  
+
     if (trailing_bytes == 1) {
       i = blocksize - 1;
-      to_buf[i] = to_buf[i] ^ (char)rs_galois_mult(from_buf[i], mult);
+      to_buf[i] = to_buf[i] ^ (char)low_mult_table[(unsigned char)from_buf[i]];
     }
   } else {
     for (i = 0; i < adj_blocksize; i++) {
-      _to_buf[i] = (uint16_t)rs_galois_mult(_from_buf[i], mult);
+      uint16_t from = _from_buf[i];
+      _to_buf[i] = low_mult_table[from & 0xff] ^ high_mult_table[from >> 8];
     }
-  
+
     if (trailing_bytes == 1) {
       i = blocksize - 1;
-      to_buf[i] = (char)rs_galois_mult(from_buf[i], mult);
+      to_buf[i] = (char)low_mult_table[(unsigned char)from_buf[i]];
     }
   }
 }
@@ -398,15 +508,43 @@ void region_dot_product(char **from_bufs, char *to_buf, int *matrix_row, int num
   }
 }
 
+// Encode in tiles of this many bytes so that, for large blocks, every
+// parity row works on source regions that are still resident in cache
+// instead of streaming all k sources from memory once per parity
+#define RS_VAND_ENCODE_TILE 65536
+
+// liberasurecode caps a stripe at EC_MAX_FRAGMENTS (32) fragments, so
+// k always fits in a fixed tile pointer array
+#define RS_VAND_MAX_FRAGMENTS 32
+
 int liberasurecode_rs_vand_encode(int *generator_matrix, char **data, char **parity, int k, int m, int blocksize)
 {
   int i;
+  int offset;
   int n = k + m;
-  
+  char *tile_data[RS_VAND_MAX_FRAGMENTS];
+
+  // liberasurecode enforces the fragment cap at instance creation, but
+  // this is public API of the standalone library, so enforce it here
+  // where the fixed array depends on it
+  if (k > RS_VAND_MAX_FRAGMENTS) return -1;
+
   for (i = k; i < n; i++) {
     memset(parity[i - k], 0, blocksize);
-    region_dot_product(data, parity[i - k], &generator_matrix[(i * k)], k, blocksize);
-  } 
+  }
+
+  for (offset = 0; offset < blocksize; offset += RS_VAND_ENCODE_TILE) {
+    int tile_size = blocksize - offset < RS_VAND_ENCODE_TILE ?
+                    blocksize - offset : RS_VAND_ENCODE_TILE;
+
+    for (i = 0; i < k; i++) {
+      tile_data[i] = data[i] + offset;
+    }
+
+    for (i = k; i < n; i++) {
+      region_dot_product(tile_data, parity[i - k] + offset, &generator_matrix[(i * k)], k, tile_size);
+    }
+  }
 
   return 0;
 }
@@ -34,6 +34,7 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
+#include <stdint.h>
 
 // We are only implementing w=16 here.  If you want to use something
 // else, then use Jerasure with GF-Complete or ISA-L.
@@ -41,14 +42,17 @@
 #define FIELD_SIZE (1 << 16)
 #define GROUP_SIZE (FIELD_SIZE - 1)
 
-int *log_table = NULL;
-int *ilog_table = NULL;
-int *ilog_table_begin = NULL;
+// Every logarithm and field element fits in 16 bits, so keeping the
+// tables at uint16_t instead of int halves their cache footprint
+// (1MB of tables becomes 512K)
+uint16_t *log_table = NULL;
+uint16_t *ilog_table = NULL;
+uint16_t *ilog_table_begin = NULL;
 
 void rs_galois_init_tables()
 {
-  log_table = (int*)malloc(sizeof(int)*FIELD_SIZE);
-  ilog_table_begin = (int*)malloc(sizeof(int)*FIELD_SIZE*3);
+  log_table = (uint16_t*)malloc(sizeof(uint16_t)*FIELD_SIZE);
+  ilog_table_begin = (uint16_t*)malloc(sizeof(uint16_t)*FIELD_SIZE*3);
   int i = 0;
   int x = 1;
 
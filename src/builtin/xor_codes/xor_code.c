@@ -22,7 +22,9 @@
  * ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
  */
 
-#ifdef INTEL_SSE2
+#ifdef INTEL_AVX2
+#include <immintrin.h>  //AVX2
+#elif defined(INTEL_SSE2)
 #include <emmintrin.h>  //SSE2
 #endif
 #include <stdio.h>
@@ -140,13 +142,48 @@ void fast_memcpy(char *dst, char *src, int size)
  */
 void xor_bufs_and_store(char *buf1, char *buf2, int blocksize)
 {
-#ifdef INTEL_SSE2
+#ifdef INTEL_AVX2
+  int residual_bytes = num_unaligned_end(blocksize);
+  int fast_blocksize = blocksize > residual_bytes ? (blocksize - residual_bytes) : 0;
+  int unrolled_blocksize = fast_blocksize - (fast_blocksize % (4 * (int)sizeof(__m256i)));
+  int i;
+
+  /*
+   * XOR the bulk of the region 128 bytes at a time: four independent
+   * 256-bit XORs per iteration keep both load ports busy.  Fragment
+   * buffers are only guaranteed 16-byte alignment, so use the
+   * unaligned load/store forms.
+   */
+  for (i=0; i < unrolled_blocksize; i += 4 * (int)sizeof(__m256i)) {
+    __m256i x0 = _mm256_loadu_si256((__m256i*)(buf1 + i));
+    __m256i x1 = _mm256_loadu_si256((__m256i*)(buf1 + i + 32));
+    __m256i x2 = _mm256_loadu_si256((__m256i*)(buf1 + i + 64));
+    __m256i x3 = _mm256_loadu_si256((__m256i*)(buf1 + i + 96));
+    __m256i y0 = _mm256_loadu_si256((__m256i*)(buf2 + i));
+    __m256i y1 = _mm256_loadu_si256((__m256i*)(buf2 + i + 32));
+    __m256i y2 = _mm256_loadu_si256((__m256i*)(buf2 + i + 64));
+    __m256i y3 = _mm256_loadu_si256((__m256i*)(buf2 + i + 96));
+    _mm256_storeu_si256((__m256i*)(buf2 + i), _mm256_xor_si256(x0, y0));
+    _mm256_storeu_si256((__m256i*)(buf2 + i + 32), _mm256_xor_si256(x1, y1));
+    _mm256_storeu_si256((__m256i*)(buf2 + i + 64), _mm256_xor_si256(x2, y2));
+    _mm256_storeu_si256((__m256i*)(buf2 + i + 96), _mm256_xor_si256(x3, y3));
+  }
+
+  /*
+   * XOR the rest of the 16-byte aligned region with 128-bit XOR
+   */
+  for (i=unrolled_blocksize; i < fast_blocksize; i += (int)sizeof(__m128i)) {
+    __m128i x = _mm_loadu_si128((__m128i*)(buf1 + i));
+    __m128i y = _mm_loadu_si128((__m128i*)(buf2 + i));
+    _mm_storeu_si128((__m128i*)(buf2 + i), _mm_xor_si128(x, y));
+  }
+#elif defined(INTEL_SSE2)
   int residual_bytes = num_unaligned_end(blocksize);
   int fast_blocksize = blocksize > residual_bytes ? (blocksize - residual_bytes) : 0;
   int fast_int_blocksize = fast_blocksize / sizeof(__m128i);
   int i;
-  __m128i *_buf1 = (__m128i*)buf1; 
-  __m128i *_buf2 = (__m128i*)buf2; 
+  __m128i *_buf1 = (__m128i*)buf1;
+  __m128i *_buf2 = (__m128i*)buf2;
 
   /*
    * XOR aligned region using 128-bit XOR